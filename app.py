@@ -3,9 +3,40 @@ import requests
 from datetime import datetime, date, timedelta
 import pandas as pd
 from openai import OpenAI
-import sqlite3
 import os
 import calendar
+import sqlite3
+import time
+from study_store import (
+    CHART_MAX_POINTS,
+    DEFAULT_DAILY_TARGET_MINUTES,
+    DOG_CACHE_SECONDS,
+    RECORD_COLUMNS,
+    REPORT_CACHE_SECONDS,
+    REPORT_LOCK_SECONDS,
+    TREND_CACHE_SECONDS,
+    WEATHER_CACHE_SECONDS,
+    BackupScheduler,
+    RecordWriteBehindQueue,
+    SharedCache,
+    SQLiteCacheBackend,
+    StudyRecord,
+    backup_database,
+    cache_key,
+    column_values,
+    compute_achievement,
+    delete_record,
+    fetch_columns,
+    fetch_data_version,
+    fetch_record,
+    fetch_records_for_month,
+    init_db,
+    list_backups,
+    load_trend_chart_data,
+    record_pomodoro_session,
+    restore_database,
+    upsert_record
+)
 
 # ==================================================
 # 기본 설정
@@ -58,191 +89,21 @@ weather_api_key = st.sidebar.text_input(
 )
 
 # ==================================================
-# Database 초기화
+# 공유 리소스 (프로세스당 하나)
 # ==================================================
-DATA_DIR = "data"
-DB_PATH = os.path.join(DATA_DIR, "study.db")
-
-
-def get_db_connection():
-    os.makedirs(DATA_DIR, exist_ok=True)
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
-
-
-def init_db():
-    with get_db_connection() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS study_records (
-                date TEXT PRIMARY KEY,
-                task_plan INTEGER NOT NULL,
-                task_deep_focus INTEGER NOT NULL,
-                task_review INTEGER NOT NULL,
-                task_practice INTEGER NOT NULL,
-                task_reading INTEGER NOT NULL,
-                task_summary INTEGER NOT NULL,
-                focus_minutes INTEGER NOT NULL,
-                break_minutes INTEGER NOT NULL,
-                sessions INTEGER NOT NULL,
-                focus_score INTEGER NOT NULL,
-                mood INTEGER NOT NULL,
-                energy INTEGER NOT NULL,
-                achievement INTEGER NOT NULL,
-                subjects TEXT NOT NULL,
-                notes TEXT NOT NULL
-            )
-            """
-        )
+@st.cache_resource
+def get_record_writer():
+    return RecordWriteBehindQueue()
 
 
-def fetch_record(record_date):
-    with get_db_connection() as conn:
-        cur = conn.execute(
-            """
-            SELECT date, task_plan, task_deep_focus, task_review,
-                   task_practice, task_reading, task_summary,
-                   focus_minutes, break_minutes, sessions,
-                   focus_score, mood, energy, achievement,
-                   subjects, notes
-            FROM study_records
-            WHERE date = ?
-            """,
-            (record_date,)
-        )
-        row = cur.fetchone()
-        if not row:
-            return None
-        subjects = [s for s in row[14].split(",") if s] if row[14] else []
-        return {
-            "date": row[0],
-            "task_plan": bool(row[1]),
-            "task_deep_focus": bool(row[2]),
-            "task_review": bool(row[3]),
-            "task_practice": bool(row[4]),
-            "task_reading": bool(row[5]),
-            "task_summary": bool(row[6]),
-            "focus_minutes": row[7],
-            "break_minutes": row[8],
-            "sessions": row[9],
-            "focus_score": row[10],
-            "mood": row[11],
-            "energy": row[12],
-            "achievement": row[13],
-            "subjects": subjects,
-            "notes": row[15]
-        }
+@st.cache_resource
+def get_backup_scheduler():
+    return BackupScheduler(get_record_writer())
 
 
-def upsert_record(record):
-    with get_db_connection() as conn:
-        conn.execute(
-            """
-            INSERT INTO study_records (
-                date, task_plan, task_deep_focus, task_review,
-                task_practice, task_reading, task_summary,
-                focus_minutes, break_minutes, sessions,
-                focus_score, mood, energy, achievement,
-                subjects, notes
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET
-                task_plan=excluded.task_plan,
-                task_deep_focus=excluded.task_deep_focus,
-                task_review=excluded.task_review,
-                task_practice=excluded.task_practice,
-                task_reading=excluded.task_reading,
-                task_summary=excluded.task_summary,
-                focus_minutes=excluded.focus_minutes,
-                break_minutes=excluded.break_minutes,
-                sessions=excluded.sessions,
-                focus_score=excluded.focus_score,
-                mood=excluded.mood,
-                energy=excluded.energy,
-                achievement=excluded.achievement,
-                subjects=excluded.subjects,
-                notes=excluded.notes
-            """,
-            (
-                record["date"],
-                int(record["task_plan"]),
-                int(record["task_deep_focus"]),
-                int(record["task_review"]),
-                int(record["task_practice"]),
-                int(record["task_reading"]),
-                int(record["task_summary"]),
-                record["focus_minutes"],
-                record["break_minutes"],
-                record["sessions"],
-                record["focus_score"],
-                record["mood"],
-                record["energy"],
-                record["achievement"],
-                ",".join(record["subjects"]),
-                record["notes"]
-            )
-        )
-
-
-def delete_record(record_date):
-    with get_db_connection() as conn:
-        conn.execute(
-            "DELETE FROM study_records WHERE date = ?",
-            (record_date,)
-        )
-
-
-def fetch_records_for_month(year, month):
-    start_date = date(year, month, 1)
-    if month == 12:
-        end_date = date(year + 1, 1, 1)
-    else:
-        end_date = date(year, month + 1, 1)
-    with get_db_connection() as conn:
-        cur = conn.execute(
-            """
-            SELECT date, achievement
-            FROM study_records
-            WHERE date >= ? AND date < ?
-            """,
-            (start_date.isoformat(), end_date.isoformat())
-        )
-        return {row[0]: row[1] for row in cur.fetchall()}
-
-
-def fetch_records_for_dates(dates):
-    if not dates:
-        return {}
-    with get_db_connection() as conn:
-        cur = conn.execute(
-            f"""
-            SELECT date, achievement, focus_minutes, sessions
-            FROM study_records
-            WHERE date IN ({",".join("?" * len(dates))})
-            """,
-            dates
-        )
-        return {
-            row[0]: {
-                "achievement": row[1],
-                "focus_minutes": row[2],
-                "sessions": row[3]
-            }
-            for row in cur.fetchall()
-        }
-
-
-def fetch_focus_data_since(start_date):
-    with get_db_connection() as conn:
-        cur = conn.execute(
-            """
-            SELECT date, focus_minutes
-            FROM study_records
-            WHERE date >= ?
-            ORDER BY date DESC
-            """,
-            (start_date,)
-        )
-        return {row[0]: row[1] for row in cur.fetchall()}
+@st.cache_resource
+def get_shared_cache():
+    return SharedCache(SQLiteCacheBackend())
 
 # ==================================================
 # API Functions
@@ -250,6 +111,14 @@ def fetch_focus_data_since(start_date):
 def get_weather(city, api_key):
     if not api_key:
         return None
+    return get_shared_cache().get_or_compute(
+        cache_key("weather", city),
+        WEATHER_CACHE_SECONDS,
+        lambda: fetch_weather(city, api_key)
+    )
+
+
+def fetch_weather(city, api_key):
     try:
         url = (
             "https://api.openweathermap.org/data/2.5/weather"
@@ -266,6 +135,15 @@ def get_weather(city, api_key):
 
 
 def get_dog_image():
+    # 리포트 캐시 키에 품종이 들어가므로 강아지도 하루 단위로 고정한다
+    return get_shared_cache().get_or_compute(
+        cache_key("dog", date.today().isoformat()),
+        DOG_CACHE_SECONDS,
+        fetch_dog_image
+    )
+
+
+def fetch_dog_image():
     try:
         res = requests.get(
             "https://dog.ceo/api/breeds/image/random",
@@ -282,7 +160,15 @@ def get_dog_image():
 def generate_report(study_data, weather, pet, style, api_key):
     if not api_key:
         return "❌ OpenAI API Key가 필요합니다."
+    return get_shared_cache().get_or_compute(
+        cache_key("report", study_data, weather, pet, style, api_key),
+        REPORT_CACHE_SECONDS,
+        lambda: request_report(study_data, weather, pet, style, api_key),
+        lock_seconds=REPORT_LOCK_SECONDS
+    )
 
+
+def request_report(study_data, weather, pet, style, api_key):
     system_prompts = {
         "스파르타 코치": "너는 매우 엄격하고 직설적인 스터디 코치다.",
         "따뜻한 멘토": "너는 공감 능력이 뛰어난 따뜻한 스터디 멘토다.",
@@ -321,8 +207,19 @@ def generate_report(study_data, weather, pet, style, api_key):
 st.subheader("✅ 오늘의 스터디 체크인")
 
 init_db()
+record_writer = get_record_writer()
+backup_scheduler = get_backup_scheduler()
 today_iso = date.today().isoformat()
-today_saved = fetch_record(today_iso) or {}
+today_saved = fetch_record(today_iso) or StudyRecord(today_iso)
+
+# 위젯 값은 날짜별로 한 번만 DB에서 채운다. 자동 저장 후 기본값이 바뀌어도
+# 위젯이 새로 만들어지면서 입력 중인 값이 사라지지 않도록 key로 상태를 유지한다.
+if st.session_state.get("today_loaded_for") != today_iso:
+    for name in RECORD_COLUMNS[1:]:
+        if name != "achievement":
+            st.session_state[f"today_{name}"] = getattr(today_saved, name)
+    st.session_state["today_loaded_for"] = today_iso
+    st.session_state.pop("autosave_last", None)
 
 st.markdown(
     '<span class="study-highlight">오늘의 스터디 모드: 집중과 회복을 균형 있게!</span>',
@@ -333,16 +230,16 @@ st.markdown("### 🧭 핵심 학습 미션")
 mission_col1, mission_col2, mission_col3 = st.columns(3)
 
 with mission_col1:
-    task_plan = st.checkbox("🗺️ 계획 세우기", value=today_saved.get("task_plan", False))
-    task_deep_focus = st.checkbox("🎯 딥 포커스", value=today_saved.get("task_deep_focus", False))
+    task_plan = st.checkbox("🗺️ 계획 세우기", key="today_task_plan")
+    task_deep_focus = st.checkbox("🎯 딥 포커스", key="today_task_deep_focus")
 
 with mission_col2:
-    task_review = st.checkbox("🔁 복습", value=today_saved.get("task_review", False))
-    task_practice = st.checkbox("🧪 문제 풀이", value=today_saved.get("task_practice", False))
+    task_review = st.checkbox("🔁 복습", key="today_task_review")
+    task_practice = st.checkbox("🧪 문제 풀이", key="today_task_practice")
 
 with mission_col3:
-    task_reading = st.checkbox("📖 읽기", value=today_saved.get("task_reading", False))
-    task_summary = st.checkbox("🧠 개념 정리", value=today_saved.get("task_summary", False))
+    task_reading = st.checkbox("📖 읽기", key="today_task_reading")
+    task_summary = st.checkbox("🧠 개념 정리", key="today_task_summary")
 
 task_values = [
     task_plan,
@@ -354,29 +251,86 @@ task_values = [
 ]
 
 st.markdown("### ⏱️ 집중 루틴")
+
+POMODORO_MINUTES_OPTIONS = [15, 25, 50]
+POMODORO_TICK_SECONDS = 1
+pomodoro_running = st.session_state.get("pomodoro_started_at") is not None
+
+
+# 타이머가 도는 동안에는 이 프래그먼트만 매초 다시 실행되고,
+# 시작/중지/완료처럼 상태가 바뀔 때만 전체 화면을 다시 그린다.
+@st.fragment(run_every=POMODORO_TICK_SECONDS if pomodoro_running else None)
+def pomodoro_timer(record_date):
+    started_at = st.session_state.get("pomodoro_started_at")
+    if started_at is None:
+        timer_cols = st.columns([2, 1])
+        timer_cols[0].selectbox(
+            "🍅 포모도로 길이 (분)",
+            POMODORO_MINUTES_OPTIONS,
+            index=1,
+            key="pomodoro_minutes"
+        )
+        if timer_cols[1].button("▶️ 포모도로 시작"):
+            st.session_state["pomodoro_started_at"] = time.time()
+            st.session_state["pomodoro_length"] = st.session_state["pomodoro_minutes"]
+            st.rerun()
+        return
+
+    length_minutes = st.session_state["pomodoro_length"]
+    length_seconds = length_minutes * 60
+    elapsed = time.time() - started_at
+    if elapsed >= length_seconds:
+        # 대기 중인 자동 저장을 먼저 반영해야 증가분이 덮어써지지 않는다
+        record_writer.flush()
+        saved = record_pomodoro_session(
+            record_date,
+            length_minutes,
+            st.session_state.get("daily_target_minutes", DEFAULT_DAILY_TARGET_MINUTES)
+        )
+        st.session_state["pomodoro_started_at"] = None
+        st.session_state["today_sessions"] = saved.sessions
+        st.session_state["today_focus_minutes"] = saved.focus_minutes
+        # 방금 쓴 행을 자동 저장 기준으로 삼아, 다음 실행에서 같은 기록을 다시 큐에 넣지 않는다
+        st.session_state["autosave_last"] = saved
+        st.toast(f"🍅 포모도로 완료! 오늘 {saved.sessions}회째 세션입니다.")
+        st.rerun()
+
+    remaining = int(length_seconds - elapsed)
+    timer_cols = st.columns([2, 1])
+    timer_cols[0].progress(
+        elapsed / length_seconds,
+        text=f"🍅 집중 중 · {remaining // 60:02d}:{remaining % 60:02d} 남음"
+    )
+    if timer_cols[1].button("⏹️ 중지"):
+        st.session_state["pomodoro_started_at"] = None
+        st.rerun()
+
+
+pomodoro_timer(today_iso)
+
 routine_col1, routine_col2, routine_col3 = st.columns(3)
 with routine_col1:
     focus_minutes = st.slider(
         "집중 시간 (분)",
         0,
         360,
-        int(today_saved.get("focus_minutes", 90)),
-        step=10
+        step=5,
+        key="today_focus_minutes"
     )
 with routine_col2:
     sessions = st.number_input(
         "포모도로 세션 수",
         min_value=0,
         max_value=12,
-        value=int(today_saved.get("sessions", 3))
+        key="today_sessions"
     )
 with routine_col3:
     break_minutes = st.slider(
         "휴식 시간 (분)",
         0,
         120,
-        int(today_saved.get("break_minutes", 30)),
-        step=5
+        step=5,
+        key="today_break_minutes"
     )
 
 subjects_options = [
@@ -393,18 +347,18 @@ subjects_options = [
 subjects = st.multiselect(
     "📌 오늘 공부한 영역",
     subjects_options,
-    default=today_saved.get("subjects", [])
+    key="today_subjects"
 )
 
 notes = st.text_area(
     "📝 학습 메모",
-    value=today_saved.get("notes", ""),
+    key="today_notes",
     placeholder="핵심 개념, 내일 할 일, 막힌 부분을 적어보세요."
 )
 
-mood = st.slider("😊 오늘 기분 점수", 1, 10, int(today_saved.get("mood", 6)))
-energy = st.slider("🔋 에너지 레벨", 1, 10, int(today_saved.get("energy", 6)))
-focus_score = st.slider("🎯 집중도 점수", 1, 10, int(today_saved.get("focus_score", 6)))
+mood = st.slider("😊 오늘 기분 점수", 1, 10, key="today_mood")
+energy = st.slider("🔋 에너지 레벨", 1, 10, key="today_energy")
+focus_score = st.slider("🎯 집중도 점수", 1, 10, key="today_focus_score")
 
 city = st.selectbox(
     "🌍 도시 선택",
@@ -422,8 +376,9 @@ daily_target_minutes = st.sidebar.number_input(
     "하루 목표 집중 시간 (분)",
     min_value=30,
     max_value=600,
-    value=120,
-    step=10
+    value=DEFAULT_DAILY_TARGET_MINUTES,
+    step=10,
+    key="daily_target_minutes"
 )
 weekly_target_sessions = st.sidebar.number_input(
     "주간 포모도로 목표",
@@ -432,14 +387,61 @@ weekly_target_sessions = st.sidebar.number_input(
     value=20,
     step=1
 )
+autosave_enabled = st.sidebar.checkbox("💾 자동 저장", value=True)
+if record_writer.last_error:
+    st.sidebar.caption(f"⚠️ 자동 저장 실패: {record_writer.last_error}")
+
+with st.sidebar.expander("🗄️ 백업 / 복원"):
+    backups = list_backups()
+    if backups:
+        st.caption(
+            "최근 백업: "
+            + datetime.fromtimestamp(os.path.getmtime(backups[0])).strftime("%Y-%m-%d %H:%M")
+        )
+    else:
+        st.caption("아직 백업이 없습니다.")
+    if backup_scheduler.last_error:
+        st.caption(f"⚠️ 자동 백업 실패: {backup_scheduler.last_error}")
+    if st.button("💾 지금 백업"):
+        try:
+            record_writer.flush()
+            backup_database()
+        except (OSError, sqlite3.Error) as exc:
+            st.error(f"백업 실패: {exc}")
+        else:
+            st.success("백업이 완료되었습니다!")
+            backups = list_backups()
+    if backups:
+        restore_choice = st.selectbox(
+            "복원할 백업",
+            backups,
+            format_func=os.path.basename
+        )
+        if st.button("♻️ 선택한 백업으로 복원"):
+            try:
+                record_writer.flush()
+                restore_database(restore_choice)
+            except ValueError as exc:
+                st.error(str(exc))
+            except (OSError, sqlite3.Error) as exc:
+                st.error(f"복원 실패: {exc}")
+            else:
+                get_shared_cache().invalidate("trend:")
+                st.session_state.pop("today_loaded_for", None)
+                st.rerun()
+
+with st.sidebar.expander("⚡ 공유 캐시"):
+    shared_cache = get_shared_cache()
+    st.caption("이 워커 프로세스 기준 통계")
+    cache_cols = st.columns(2)
+    cache_cols[0].metric("적중률", f"{shared_cache.hit_rate():.0%}")
+    cache_cols[1].metric("저장된 항목", shared_cache.backend.size())
+    st.caption(f"적중 {shared_cache.hits}회 · 미스 {shared_cache.misses}회")
 
 # ==================================================
 # 달성률 계산
 # ==================================================
-task_score = (sum(task_values) / len(task_values)) * 40
-time_score = min(focus_minutes / daily_target_minutes, 1) * 50
-focus_score_component = (focus_score / 10) * 10
-achievement = int(task_score + time_score + focus_score_component)
+achievement = compute_achievement(task_values, focus_minutes, focus_score, daily_target_minutes)
 
 today_cards = st.columns(4)
 today_cards[0].metric("🎯 학습 달성률", f"{achievement}%")
@@ -450,27 +452,40 @@ today_cards[3].metric("🔋 에너지", f"{energy}/10")
 # ==================================================
 # 기록 저장
 # ==================================================
-today_record = {
-    "date": today_iso,
-    "task_plan": task_plan,
-    "task_deep_focus": task_deep_focus,
-    "task_review": task_review,
-    "task_practice": task_practice,
-    "task_reading": task_reading,
-    "task_summary": task_summary,
-    "focus_minutes": focus_minutes,
-    "break_minutes": break_minutes,
-    "sessions": sessions,
-    "focus_score": focus_score,
-    "mood": mood,
-    "energy": energy,
-    "achievement": achievement,
-    "subjects": subjects,
-    "notes": notes
-}
+today_record = StudyRecord(
+    date=today_iso,
+    task_plan=task_plan,
+    task_deep_focus=task_deep_focus,
+    task_review=task_review,
+    task_practice=task_practice,
+    task_reading=task_reading,
+    task_summary=task_summary,
+    focus_minutes=focus_minutes,
+    break_minutes=break_minutes,
+    sessions=sessions,
+    focus_score=focus_score,
+    mood=mood,
+    energy=energy,
+    achievement=achievement,
+    subjects=subjects,
+    notes=notes
+)
+
+# 세션별로 마지막으로 반영한 값과 비교해 바뀐 경우에만 큐에 넣는다
+last_autosaved = st.session_state.get("autosave_last")
+if last_autosaved is None or last_autosaved.date != today_iso:
+    st.session_state["autosave_last"] = today_record
+elif autosave_enabled and today_record != last_autosaved:
+    record_writer.submit(today_record)
+    st.session_state["autosave_last"] = today_record
+
+if autosave_enabled:
+    st.caption("💾 변경 사항은 잠시 후 자동으로 저장됩니다.")
 
 if st.button("📌 오늘 기록 저장"):
-    upsert_record(today_record)
+    record_writer.submit(today_record)
+    record_writer.flush()
+    st.session_state["autosave_last"] = today_record
     st.success("기록이 저장되었습니다!")
 
 # ==================================================
@@ -480,13 +495,19 @@ recent_dates = [
     (date.today() - timedelta(days=offset)).isoformat()
     for offset in range(6, -1, -1)
 ]
-recent_records = fetch_records_for_dates(recent_dates)
-chart_df = pd.DataFrame({
-    "day": [datetime.fromisoformat(d).strftime("%m/%d") for d in recent_dates],
-    "achievement": [recent_records.get(d, {}).get("achievement", 0) for d in recent_dates],
-    "focus_minutes": [recent_records.get(d, {}).get("focus_minutes", 0) for d in recent_dates],
-    "sessions": [recent_records.get(d, {}).get("sessions", 0) for d in recent_dates]
-})
+recent_columns = fetch_columns(
+    ("date", "achievement", "focus_minutes", "sessions"),
+    recent_dates[0],
+    (date.today() + timedelta(days=1)).isoformat()
+)
+chart_df = pd.DataFrame(
+    {
+        name: column_values(recent_columns[name])
+        for name in ("achievement", "focus_minutes", "sessions")
+    },
+    index=recent_columns["date"]
+).reindex(recent_dates, fill_value=0)
+chart_df.insert(0, "day", [datetime.fromisoformat(d).strftime("%m/%d") for d in recent_dates])
 
 st.subheader("📊 최근 7일 스터디 리듬")
 chart_cols = st.columns(2)
@@ -508,9 +529,11 @@ week_cols[2].metric("포모도로 목표", f"{weekly_target_sessions}회")
 st.markdown("### 🔥 집중 스트릭")
 streak_threshold = max(int(daily_target_minutes * 0.6), 1)
 lookback_days = 60
-focus_map = fetch_focus_data_since(
+focus_columns = fetch_columns(
+    ("date", "focus_minutes"),
     (date.today() - timedelta(days=lookback_days)).isoformat()
 )
+focus_map = dict(zip(focus_columns["date"], focus_columns["focus_minutes"]))
 current_streak = 0
 for offset in range(0, lookback_days):
     day = (date.today() - timedelta(days=offset)).isoformat()
@@ -535,6 +558,31 @@ streak_cols = st.columns(2)
 streak_cols[0].metric("현재 스트릭", f"{current_streak}일")
 streak_cols[1].metric("베스트 스트릭(최근 60일)", f"{best_streak}일")
 
+st.subheader("📈 장기 스터디 추이")
+trend_range = st.radio(
+    "기간 선택",
+    ["30일", "1년", "전체"],
+    horizontal=True,
+    key="trend_range"
+)
+trend_data = get_shared_cache().get_or_compute(
+    cache_key("trend", trend_range, today_iso, fetch_data_version()),
+    TREND_CACHE_SECONDS,
+    lambda: load_trend_chart_data(trend_range)
+)
+if trend_data["achievement"].empty:
+    st.info("아직 표시할 기록이 없습니다.")
+else:
+    if trend_range != "30일":
+        st.caption(f"주 단위 평균 · 최대 {CHART_MAX_POINTS}개 지점으로 요약")
+    trend_cols = st.columns(2)
+    with trend_cols[0]:
+        st.markdown("**평균 달성률**")
+        st.line_chart(trend_data["achievement"].rename("achievement"))
+    with trend_cols[1]:
+        st.markdown("**평균 집중 시간 (분)**")
+        st.line_chart(trend_data["focus_minutes"].rename("focus_minutes"))
+
 # ==================================================
 # 달력 + 상세 패널
 # ==================================================
@@ -568,63 +616,73 @@ with calendar_col:
         width="stretch"
     )
 
+
+def reload_today_checkin(level, message):
+    # 오늘 기록을 상세 패널에서 바꾸면 체크인 위젯을 DB 값으로 다시 채워야
+    # 이전 값이 자동 저장으로 되살아나지 않는다. 안내 메시지는 다시 실행된 뒤 보여준다.
+    st.session_state.pop("today_loaded_for", None)
+    st.session_state.pop("autosave_last", None)
+    st.session_state["detail_notice"] = (level, message)
+    st.rerun()
+
+
 with detail_col:
     st.markdown("### 📋 선택한 날짜 기록")
     selected_date = st.date_input("기록 날짜 선택", date.today(), key="detail_date")
     selected_iso = selected_date.isoformat()
-    selected_record = fetch_record(selected_iso)
+    selected_record = fetch_record(selected_iso) or StudyRecord(selected_iso)
 
     with st.form("detail_form"):
         detail_task_plan = st.checkbox(
             "🗺️ 계획 세우기",
-            value=bool(selected_record and selected_record["task_plan"]),
+            value=selected_record.task_plan,
             key="detail_task_plan"
         )
         detail_task_deep_focus = st.checkbox(
             "🎯 딥 포커스",
-            value=bool(selected_record and selected_record["task_deep_focus"]),
+            value=selected_record.task_deep_focus,
             key="detail_task_deep_focus"
         )
         detail_task_review = st.checkbox(
             "🔁 복습",
-            value=bool(selected_record and selected_record["task_review"]),
+            value=selected_record.task_review,
             key="detail_task_review"
         )
         detail_task_practice = st.checkbox(
             "🧪 문제 풀이",
-            value=bool(selected_record and selected_record["task_practice"]),
+            value=selected_record.task_practice,
             key="detail_task_practice"
         )
         detail_task_reading = st.checkbox(
             "📖 읽기",
-            value=bool(selected_record and selected_record["task_reading"]),
+            value=selected_record.task_reading,
             key="detail_task_reading"
         )
         detail_task_summary = st.checkbox(
             "🧠 개념 정리",
-            value=bool(selected_record and selected_record["task_summary"]),
+            value=selected_record.task_summary,
             key="detail_task_summary"
         )
         detail_focus_minutes = st.slider(
             "집중 시간 (분)",
             0,
             360,
-            int(selected_record["focus_minutes"]) if selected_record else 90,
-            step=10,
+            selected_record.focus_minutes,
+            step=5,
             key="detail_focus_minutes"
         )
         detail_sessions = st.number_input(
             "포모도로 세션 수",
             min_value=0,
             max_value=12,
-            value=int(selected_record["sessions"]) if selected_record else 3,
+            value=selected_record.sessions,
             key="detail_sessions"
         )
         detail_break_minutes = st.slider(
             "휴식 시간 (분)",
             0,
             120,
-            int(selected_record["break_minutes"]) if selected_record else 30,
+            selected_record.break_minutes,
             step=5,
             key="detail_break_minutes"
         )
@@ -632,32 +690,32 @@ with detail_col:
             "🎯 집중도 점수",
             1,
             10,
-            int(selected_record["focus_score"]) if selected_record else 6,
+            selected_record.focus_score,
             key="detail_focus_score"
         )
         detail_mood = st.slider(
             "😊 기분 점수",
             1,
             10,
-            int(selected_record["mood"]) if selected_record else 6,
+            selected_record.mood,
             key="detail_mood"
         )
         detail_energy = st.slider(
             "🔋 에너지 레벨",
             1,
             10,
-            int(selected_record["energy"]) if selected_record else 6,
+            selected_record.energy,
             key="detail_energy"
         )
         detail_subjects = st.multiselect(
             "📌 오늘 공부한 영역",
             subjects_options,
-            default=selected_record["subjects"] if selected_record else [],
+            default=selected_record.subjects,
             key="detail_subjects"
         )
         detail_notes = st.text_area(
             "📝 학습 메모",
-            value=selected_record["notes"] if selected_record else "",
+            value=selected_record.notes,
             key="detail_notes"
         )
         detail_task_values = [
@@ -668,40 +726,53 @@ with detail_col:
             detail_task_reading,
             detail_task_summary
         ]
-        detail_task_score = (sum(detail_task_values) / len(detail_task_values)) * 40
-        detail_time_score = min(detail_focus_minutes / daily_target_minutes, 1) * 50
-        detail_focus_component = (detail_focus_score / 10) * 10
-        detail_achievement = int(detail_task_score + detail_time_score + detail_focus_component)
+        detail_achievement = compute_achievement(
+            detail_task_values,
+            detail_focus_minutes,
+            detail_focus_score,
+            daily_target_minutes
+        )
         st.caption(f"달성률: {detail_achievement}%")
         submitted = st.form_submit_button("💾 기록 수정 저장")
 
     if submitted:
+        record_writer.discard(selected_iso)
         upsert_record(
-            {
-                "date": selected_iso,
-                "task_plan": detail_task_plan,
-                "task_deep_focus": detail_task_deep_focus,
-                "task_review": detail_task_review,
-                "task_practice": detail_task_practice,
-                "task_reading": detail_task_reading,
-                "task_summary": detail_task_summary,
-                "focus_minutes": detail_focus_minutes,
-                "break_minutes": detail_break_minutes,
-                "sessions": detail_sessions,
-                "focus_score": detail_focus_score,
-                "mood": detail_mood,
-                "energy": detail_energy,
-                "achievement": detail_achievement,
-                "subjects": detail_subjects,
-                "notes": detail_notes
-            }
+            StudyRecord(
+                date=selected_iso,
+                task_plan=detail_task_plan,
+                task_deep_focus=detail_task_deep_focus,
+                task_review=detail_task_review,
+                task_practice=detail_task_practice,
+                task_reading=detail_task_reading,
+                task_summary=detail_task_summary,
+                focus_minutes=detail_focus_minutes,
+                break_minutes=detail_break_minutes,
+                sessions=detail_sessions,
+                focus_score=detail_focus_score,
+                mood=detail_mood,
+                energy=detail_energy,
+                achievement=detail_achievement,
+                subjects=detail_subjects,
+                notes=detail_notes
+            )
         )
+        if selected_iso == today_iso:
+            reload_today_checkin("success", "기록이 저장되었습니다!")
         st.success("기록이 저장되었습니다!")
 
     if st.button("🗑️ 기록 삭제", type="secondary"):
+        record_writer.discard(selected_iso)
         delete_record(selected_iso)
+        if selected_iso == today_iso:
+            reload_today_checkin("warning", "기록이 삭제되었습니다.")
         st.warning("기록이 삭제되었습니다.")
 
+    detail_notice = st.session_state.pop("detail_notice", None)
+    if detail_notice:
+        level, message = detail_notice
+        getattr(st, level)(message)
+
 # ==================================================
 # 오늘의 요약 카드
 # ==================================================
@@ -0,0 +1,88 @@
+# 큰 합성 DB에서 온라인 백업 시간과, 백업 도중 리런과 비슷한 읽기+쓰기 지연을 잰다.
+# 사용법: python benchmarks/bench_backup.py [행 수]
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import study_store  # noqa: E402
+from study_store import StudyRecord  # noqa: E402
+
+DEFAULT_ROWS = 500_000
+IDLE_SECONDS = 3
+FIRST_DAY = date(1, 1, 1)
+
+
+def seed(rows):
+    batch = []
+    for offset in range(rows):
+        batch.append(StudyRecord(
+            (FIRST_DAY + timedelta(days=offset)).isoformat(),
+            focus_minutes=random.randint(0, 360),
+            achievement=random.randint(0, 100),
+            subjects=["수학", "코딩"],
+            notes="x" * 200
+        ))
+        if len(batch) == 50_000:
+            study_store.upsert_records(batch)
+            batch = []
+    if batch:
+        study_store.upsert_records(batch)
+
+
+def rerun_like_load(rows, stop, latencies):
+    # 한 번의 리런처럼 하루치 기록을 읽고 한 행을 고쳐 쓴다
+    while not stop.is_set():
+        record_date = (FIRST_DAY + timedelta(days=random.randrange(rows))).isoformat()
+        started = time.perf_counter()
+        record = study_store.fetch_record(record_date)
+        record.notes = "y" * 200
+        study_store.upsert_record(record)
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(0.01)
+
+
+def measure(label, rows, action):
+    latencies = []
+    stop = threading.Event()
+    worker = threading.Thread(target=rerun_like_load, args=(rows, stop, latencies))
+    worker.start()
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worker.join()
+    latencies.sort()
+    print(
+        f"{label:<8} {elapsed:6.2f}s  ops={len(latencies):<5} "
+        f"p50={latencies[len(latencies) // 2]:6.2f}ms "
+        f"p99={latencies[int(len(latencies) * 0.99)]:6.2f}ms "
+        f"max={latencies[-1]:6.2f}ms"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        study_store.DATA_DIR = tmp
+        study_store.DB_PATH = os.path.join(tmp, "study.db")
+        study_store.BACKUP_DIR = os.path.join(tmp, "backups")
+        study_store.init_db()
+        seed(rows)
+        size_mb = os.path.getsize(study_store.DB_PATH) / 1e6
+        print(
+            f"rows={rows} db={size_mb:.0f}MB pages/step={study_store.BACKUP_PAGES_PER_STEP} "
+            f"pause={study_store.BACKUP_STEP_PAUSE_SECONDS * 1000:.0f}ms"
+        )
+        measure("idle", rows, lambda: time.sleep(IDLE_SECONDS))
+        measure("backup", rows, study_store.backup_database)
+
+
+if __name__ == "__main__":
+    main()
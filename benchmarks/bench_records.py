@@ -0,0 +1,137 @@
+# 전체 기록 로딩의 시간과 메모리를 잰다: 행마다 dict를 만들던 이전 방식 대비
+# StudyRecord 행 팩토리와 컬럼 단위 fetch_columns.
+# 사용법: python benchmarks/bench_records.py [행 수]
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import study_store  # noqa: E402
+from study_store import (  # noqa: E402
+    RECORD_COLUMN_LIST,
+    StudyRecord,
+    column_values,
+    fetch_columns,
+    study_record_factory
+)
+
+DEFAULT_ROWS = 100_000
+REPEATS = 3
+CHART_COLUMNS = ("date", "achievement", "focus_minutes", "sessions")
+
+
+def seed(rows):
+    first_day = date(1800, 1, 1)
+    study_store.upsert_records([
+        StudyRecord(
+            (first_day + timedelta(days=offset)).isoformat(),
+            task_plan=True,
+            task_review=True,
+            focus_minutes=random.randint(0, 360),
+            achievement=random.randint(0, 100),
+            subjects=["수학", "코딩"],
+            notes="메모"
+        )
+        for offset in range(rows)
+    ])
+
+
+def dict_rows():
+    # 이전 fetch_record와 같은 방식으로 행마다 dict를 만든다
+    with study_store.get_db_connection() as conn:
+        rows = conn.execute(
+            f"SELECT {RECORD_COLUMN_LIST} FROM study_records ORDER BY date"
+        ).fetchall()
+    result = []
+    for row in rows:
+        subjects = [s for s in row[14].split(",") if s] if row[14] else []
+        result.append({
+            "date": row[0],
+            "task_plan": bool(row[1]),
+            "task_deep_focus": bool(row[2]),
+            "task_review": bool(row[3]),
+            "task_practice": bool(row[4]),
+            "task_reading": bool(row[5]),
+            "task_summary": bool(row[6]),
+            "focus_minutes": row[7],
+            "break_minutes": row[8],
+            "sessions": row[9],
+            "focus_score": row[10],
+            "mood": row[11],
+            "energy": row[12],
+            "achievement": row[13],
+            "subjects": subjects,
+            "notes": row[15]
+        })
+    return result
+
+
+def record_rows():
+    with study_store.get_db_connection() as conn:
+        conn.row_factory = study_record_factory
+        return conn.execute(
+            f"SELECT {RECORD_COLUMN_LIST} FROM study_records ORDER BY date"
+        ).fetchall()
+
+
+def dict_columns():
+    # 이전 fetch_records_for_dates와 같은 방식으로 날짜별 dict를 만든다
+    with study_store.get_db_connection() as conn:
+        rows = conn.execute(
+            f"SELECT {', '.join(CHART_COLUMNS)} FROM study_records ORDER BY date"
+        ).fetchall()
+    return {
+        row[0]: {"achievement": row[1], "focus_minutes": row[2], "sessions": row[3]}
+        for row in rows
+    }
+
+
+def typed_columns():
+    columns = fetch_columns(CHART_COLUMNS)
+    return columns, [column_values(columns[name]) for name in CHART_COLUMNS[1:]]
+
+
+def measure(label, fn):
+    elapsed = None
+    for _ in range(REPEATS):
+        gc.collect()
+        started = time.perf_counter()
+        result = fn()
+        run = time.perf_counter() - started
+        elapsed = run if elapsed is None else min(elapsed, run)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(
+        f"{label:<34} {elapsed * 1000:8.1f}ms "
+        f"retained={retained / 1e6:6.1f}MB peak={peak / 1e6:6.1f}MB"
+    )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        study_store.DATA_DIR = tmp
+        study_store.DB_PATH = os.path.join(tmp, "study.db")
+        study_store.init_db()
+        seed(rows)
+        print(f"rows={rows}")
+        measure("before: full rows -> dict", dict_rows)
+        measure("after:  full rows -> StudyRecord", record_rows)
+        measure("before: 4 columns -> dict per row", dict_columns)
+        measure("after:  fetch_columns + np view", typed_columns)
+
+
+if __name__ == "__main__":
+    main()
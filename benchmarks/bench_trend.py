@@ -0,0 +1,106 @@
+# 기록 기간별로 장기 추이 차트의 지점 수, Arrow 페이로드 크기, 집계 시간,
+# 차트 스펙(Altair → Vega-Lite JSON) 생성 시간을 잰다.
+# 브라우저에서 Vega가 그리는 시간은 여기서 잴 수 없으므로, 전송되는 Arrow 페이로드
+# 크기와 스펙 생성 시간을 렌더링 비용의 대용 지표로 삼는다.
+# 사용법: python benchmarks/bench_trend.py
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import study_store  # noqa: E402
+from study_store import StudyRecord  # noqa: E402
+
+HISTORY_YEARS = [1, 10, 50]
+RANGES = ["30일", "1년", "전체"]
+REPEATS = 5
+
+
+def arrow_payload_bytes(series):
+    table = pa.Table.from_pandas(series.rename("value").to_frame().reset_index())
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return len(sink.getvalue())
+
+
+def build_chart_spec(series):
+    # st.line_chart가 내부에서 만드는 것과 같은 꼴의 Altair 선 그래프를 직렬화한다
+    frame = series.rename("value").to_frame().reset_index()
+    return alt.Chart(frame).mark_line().encode(x="date:T", y="value:Q").to_json()
+
+
+def seed(days):
+    today = date.today()
+    study_store.upsert_records([
+        StudyRecord(
+            (today - timedelta(days=offset)).isoformat(),
+            focus_minutes=random.randint(0, 360),
+            achievement=random.randint(0, 100)
+        )
+        for offset in range(days)
+    ])
+
+
+def naive_daily_series():
+    # 비교 기준: 전체 일별 기록을 그대로 pandas로 옮겨 차트에 넘기는 방식
+    with study_store.get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT date, achievement FROM study_records ORDER BY date"
+        ).fetchall()
+    return pd.Series(
+        [row[1] for row in rows],
+        index=pd.DatetimeIndex([row[0] for row in rows], name="date")
+    )
+
+
+def timed(fn):
+    best = None
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+
+def main():
+    random.seed(0)
+    # Streamlit처럼 행 수 제한 없이 직렬화한다
+    alt.data_transformers.disable_max_rows()
+    print(
+        f"{'history':>8} {'range':>8} {'points':>7} {'payload':>10} "
+        f"{'time':>9} {'spec':>9}"
+    )
+    for years in HISTORY_YEARS:
+        with tempfile.TemporaryDirectory() as tmp:
+            study_store.DATA_DIR = tmp
+            study_store.DB_PATH = os.path.join(tmp, "study.db")
+            study_store.init_db()
+            seed(365 * years)
+            for label in RANGES:
+                data, ms = timed(lambda: study_store.load_trend_chart_data(label))
+                series = data["achievement"]
+                _, spec_ms = timed(lambda: build_chart_spec(series))
+                print(
+                    f"{years:>7}y {label:>8} {len(series):>7} "
+                    f"{arrow_payload_bytes(series):>9}B {ms:>7.1f}ms {spec_ms:>7.1f}ms"
+                )
+            series, ms = timed(naive_daily_series)
+            _, spec_ms = timed(lambda: build_chart_spec(series))
+            print(
+                f"{years:>7}y {'naive':>8} {len(series):>7} "
+                f"{arrow_payload_bytes(series):>9}B {ms:>7.1f}ms {spec_ms:>7.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,824 @@
+import os
+import sqlite3
+import threading
+import time
+import atexit
+import hashlib
+import pickle
+import uuid
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass, field, fields
+from datetime import datetime, date, timedelta
+import numpy as np
+import pandas as pd
+
+# ==================================================
+# Database 초기화
+# ==================================================
+DATA_DIR = "data"
+DB_PATH = os.path.join(DATA_DIR, "study.db")
+
+
+# 필드 순서가 곧 study_records 컬럼 순서다. 조회/저장 SQL은 모두 이 순서를 따른다.
+# 기본값은 기록이 없는 날 체크인 화면에 보여줄 값이다.
+@dataclass(slots=True)
+class StudyRecord:
+    date: str
+    task_plan: bool = False
+    task_deep_focus: bool = False
+    task_review: bool = False
+    task_practice: bool = False
+    task_reading: bool = False
+    task_summary: bool = False
+    focus_minutes: int = 90
+    break_minutes: int = 30
+    sessions: int = 3
+    focus_score: int = 6
+    mood: int = 6
+    energy: int = 6
+    achievement: int = 0
+    subjects: list = field(default_factory=list)
+    notes: str = ""
+
+    @classmethod
+    def from_row(cls, row):
+        values = list(row)
+        for index, decode in ROW_DECODERS:
+            values[index] = decode(values[index])
+        return cls(*values)
+
+    def to_row(self):
+        values = [getattr(self, name) for name in RECORD_COLUMNS]
+        for index, encode in ROW_ENCODERS:
+            values[index] = encode(values[index])
+        return tuple(values)
+
+
+def decode_subjects(value):
+    return [s for s in value.split(",") if s] if value else []
+
+
+# 필드 타입별 DB 값 변환 (int/str은 그대로 쓴다).
+# 필드를 추가하거나 순서를 바꿔도 SQL과 변환이 함께 따라간다.
+COLUMN_DECODERS = {bool: bool, list: decode_subjects}
+COLUMN_ENCODERS = {bool: int, list: ",".join}
+
+RECORD_FIELDS = fields(StudyRecord)
+RECORD_COLUMNS = tuple(f.name for f in RECORD_FIELDS)
+RECORD_COLUMN_LIST = ", ".join(RECORD_COLUMNS)
+INTEGER_COLUMNS = tuple(f.name for f in RECORD_FIELDS if f.type in (bool, int))
+TASK_COLUMNS = tuple(f.name for f in RECORD_FIELDS if f.type is bool)
+ROW_DECODERS = tuple(
+    (index, COLUMN_DECODERS[f.type])
+    for index, f in enumerate(RECORD_FIELDS)
+    if f.type in COLUMN_DECODERS
+)
+ROW_ENCODERS = tuple(
+    (index, COLUMN_ENCODERS[f.type])
+    for index, f in enumerate(RECORD_FIELDS)
+    if f.type in COLUMN_ENCODERS
+)
+DEFAULT_DAILY_TARGET_MINUTES = 120
+
+
+def study_record_factory(cursor, row):
+    return StudyRecord.from_row(row)
+
+
+def get_db_connection():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return sqlite3.connect(DB_PATH, check_same_thread=False)
+
+
+def init_db():
+    with get_db_connection() as conn:
+        # WAL 모드에서는 백업이 읽는 동안에도 다른 세션의 읽기/쓰기가 막히지 않는다
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS study_records (
+                date TEXT PRIMARY KEY,
+                task_plan INTEGER NOT NULL,
+                task_deep_focus INTEGER NOT NULL,
+                task_review INTEGER NOT NULL,
+                task_practice INTEGER NOT NULL,
+                task_reading INTEGER NOT NULL,
+                task_summary INTEGER NOT NULL,
+                focus_minutes INTEGER NOT NULL,
+                break_minutes INTEGER NOT NULL,
+                sessions INTEGER NOT NULL,
+                focus_score INTEGER NOT NULL,
+                mood INTEGER NOT NULL,
+                energy INTEGER NOT NULL,
+                achievement INTEGER NOT NULL,
+                subjects TEXT NOT NULL,
+                notes TEXT NOT NULL
+            )
+            """
+        )
+        # 기록이 바뀔 때마다 올라가는 버전. 대시보드 캐시 키에 포함해 무효화한다
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS study_data_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("INSERT OR IGNORE INTO study_data_version VALUES (1, 0)")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS study_records_{event.lower()}_version
+                AFTER {event} ON study_records
+                BEGIN
+                    UPDATE study_data_version SET version = version + 1;
+                END
+                """
+            )
+
+
+def fetch_data_version():
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT version FROM study_data_version").fetchone()
+        return row[0] if row else 0
+
+
+def fetch_record(record_date):
+    with get_db_connection() as conn:
+        conn.row_factory = study_record_factory
+        cur = conn.execute(
+            f"SELECT {RECORD_COLUMN_LIST} FROM study_records WHERE date = ?",
+            (record_date,)
+        )
+        return cur.fetchone()
+
+
+UPSERT_SQL = f"""
+    INSERT INTO study_records ({RECORD_COLUMN_LIST})
+    VALUES ({", ".join("?" * len(RECORD_COLUMNS))})
+    ON CONFLICT(date) DO UPDATE SET
+        {", ".join(f"{name}=excluded.{name}" for name in RECORD_COLUMNS[1:])}
+"""
+
+
+def upsert_record(record):
+    upsert_records([record])
+
+
+def upsert_records(records):
+    # 여러 날짜의 기록을 하나의 트랜잭션으로 저장
+    with get_db_connection() as conn:
+        conn.executemany(UPSERT_SQL, [r.to_row() for r in records])
+
+
+def delete_record(record_date):
+    with get_db_connection() as conn:
+        conn.execute(
+            "DELETE FROM study_records WHERE date = ?",
+            (record_date,)
+        )
+
+
+def compute_achievement(task_values, focus_minutes, focus_score, daily_target_minutes):
+    task_score = (sum(task_values) / len(task_values)) * 40
+    time_score = min(focus_minutes / daily_target_minutes, 1) * 50
+    focus_score_component = (focus_score / 10) * 10
+    return int(task_score + time_score + focus_score_component)
+
+
+def record_pomodoro_session(record_date, minutes, daily_target_minutes):
+    # 16개 컬럼 전체를 다시 쓰지 않고 세션 수, 집중 시간, 달성률만 고친다.
+    # 상한은 체크인 위젯 범위(세션 12회, 집중 360분)에 맞춘다.
+    with get_db_connection() as conn:
+        conn.row_factory = study_record_factory
+        conn.execute("BEGIN IMMEDIATE")
+        record = conn.execute(
+            f"SELECT {RECORD_COLUMN_LIST} FROM study_records WHERE date = ?",
+            (record_date,)
+        ).fetchone()
+        is_new = record is None
+        if is_new:
+            record = StudyRecord(record_date, focus_minutes=0, break_minutes=0, sessions=0)
+        record.sessions = min(record.sessions + 1, 12)
+        record.focus_minutes = min(record.focus_minutes + minutes, 360)
+        record.achievement = compute_achievement(
+            [getattr(record, name) for name in TASK_COLUMNS],
+            record.focus_minutes,
+            record.focus_score,
+            daily_target_minutes
+        )
+        if is_new:
+            conn.execute(UPSERT_SQL, record.to_row())
+        else:
+            conn.execute(
+                """
+                UPDATE study_records
+                SET sessions = ?, focus_minutes = ?, achievement = ?
+                WHERE date = ?
+                """,
+                (record.sessions, record.focus_minutes, record.achievement, record_date)
+            )
+    return record
+
+
+def fetch_records_for_month(year, month):
+    start_date = date(year, month, 1)
+    if month == 12:
+        end_date = date(year + 1, 1, 1)
+    else:
+        end_date = date(year, month + 1, 1)
+    with get_db_connection() as conn:
+        cur = conn.execute(
+            """
+            SELECT date, achievement
+            FROM study_records
+            WHERE date >= ? AND date < ?
+            """,
+            (start_date.isoformat(), end_date.isoformat())
+        )
+        return {row[0]: row[1] for row in cur.fetchall()}
+
+
+def fetch_columns(columns, start_date=None, end_date=None):
+    # 전체 기록을 다룰 때 행마다 dict/객체를 만들지 않도록 컬럼별 배열로 모은다.
+    # 정수 컬럼은 array('q')라 column_values()로 복사 없이 NumPy 배열로 볼 수 있다.
+    unknown = [name for name in columns if name not in RECORD_COLUMNS]
+    if unknown:
+        raise ValueError(f"알 수 없는 컬럼: {unknown}")
+    conditions = []
+    params = []
+    if start_date:
+        conditions.append("date >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("date < ?")
+        params.append(end_date)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    result = {
+        name: array("q") if name in INTEGER_COLUMNS else []
+        for name in columns
+    }
+    appenders = [result[name].append for name in columns]
+    with get_db_connection() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT {", ".join(columns)}
+            FROM study_records
+            {where}
+            ORDER BY date
+            """,
+            params
+        )
+        for row in cur:
+            for append, value in zip(appenders, row):
+                append(value)
+    return result
+
+
+def column_values(column):
+    if isinstance(column, array):
+        return np.frombuffer(column, dtype=np.int64)
+    return np.asarray(column)
+
+
+# ==================================================
+# 장기 추이 집계
+# ==================================================
+CHART_MAX_POINTS = 120
+
+# 버킷 시작일을 만드는 SQL 식 (주 단위는 월요일 시작)
+TREND_BUCKETS = {
+    "day": "date",
+    "week": "date(date, '-6 days', 'weekday 1')"
+}
+
+
+def fetch_trend(bucket, start_date=None):
+    bucket_expr = TREND_BUCKETS[bucket]
+    where = "WHERE date >= ?" if start_date else ""
+    params = (start_date,) if start_date else ()
+    with get_db_connection() as conn:
+        cur = conn.execute(
+            f"""
+            SELECT {bucket_expr} AS bucket,
+                   AVG(achievement), AVG(focus_minutes)
+            FROM study_records
+            {where}
+            GROUP BY bucket
+            ORDER BY bucket
+            """,
+            params
+        )
+        return cur.fetchall()
+
+
+def lttb_indices(xs, ys, threshold):
+    # Largest-Triangle-Three-Buckets: 모양을 유지하면서 threshold개 점만 남긴다
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    anchor = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        next_count = next_end - end
+        avg_x = sum(xs[end:next_end]) / next_count
+        avg_y = sum(ys[end:next_end]) / next_count
+        ax, ay = xs[anchor], ys[anchor]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        anchor = best
+    selected.append(n - 1)
+    return selected
+
+
+def build_trend_series(rows, column, max_points=CHART_MAX_POINTS):
+    days = [date.fromisoformat(row[0]) for row in rows]
+    values = [row[column] for row in rows]
+    keep = lttb_indices([d.toordinal() for d in days], values, max_points)
+    return pd.Series(
+        [round(values[i], 1) for i in keep],
+        index=pd.DatetimeIndex([days[i] for i in keep], name="date")
+    )
+
+
+def load_trend_chart_data(range_label):
+    today = date.today()
+    if range_label == "30일":
+        rows = fetch_trend("day", (today - timedelta(days=29)).isoformat())
+    elif range_label == "1년":
+        rows = fetch_trend("week", (today - timedelta(days=364)).isoformat())
+    else:
+        rows = fetch_trend("week")
+    return {
+        "achievement": build_trend_series(rows, 1),
+        "focus_minutes": build_trend_series(rows, 2)
+    }
+
+
+# ==================================================
+# 자동 저장 (write-behind 큐)
+# ==================================================
+AUTOSAVE_DEBOUNCE_SECONDS = 2.0
+AUTOSAVE_MAX_DELAY_SECONDS = 10.0
+
+
+# 같은 날짜의 변경은 마지막 값만 남기고, 입력이 멈추거나 최대 지연 시간이 지나면
+# 백그라운드 스레드가 대기 중인 기록을 하나의 트랜잭션으로 저장한다.
+class RecordWriteBehindQueue:
+    def __init__(
+        self,
+        debounce_seconds=AUTOSAVE_DEBOUNCE_SECONDS,
+        max_delay_seconds=AUTOSAVE_MAX_DELAY_SECONDS
+    ):
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.last_error = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="record-write-behind",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record):
+        now = time.monotonic()
+        with self._lock:
+            previous = self._pending.get(record.date)
+            first_seen = previous[2] if previous else now
+            due = min(now + self.debounce_seconds, first_seen + self.max_delay_seconds)
+            self._pending[record.date] = (record, due, first_seen)
+        self._wake.set()
+
+    def discard(self, record_date):
+        with self._lock:
+            self._pending.pop(record_date, None)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        self._drain(force=True)
+
+    def close(self):
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _next_timeout(self):
+        with self._lock:
+            if not self._pending:
+                return None
+            due = min(item[1] for item in self._pending.values())
+        return max(due - time.monotonic(), 0)
+
+    def _drain(self, force=False):
+        with self._write_lock:
+            now = time.monotonic()
+            with self._lock:
+                due_dates = [
+                    record_date
+                    for record_date, (_, due, _) in self._pending.items()
+                    if force or due <= now
+                ]
+                batch = [self._pending.pop(d) for d in due_dates]
+            if not batch:
+                return
+            try:
+                upsert_records([record for record, _, _ in batch])
+            except Exception:
+                # 실패한 기록은 그 사이 새 값이 들어오지 않았다면 다시 대기열에 넣는다
+                with self._lock:
+                    for record, _, first_seen in batch:
+                        self._pending.setdefault(
+                            record.date,
+                            (record, now + self.debounce_seconds, first_seen)
+                        )
+                raise
+
+    def _run(self):
+        while not self._closed.is_set():
+            self._wake.wait(self._next_timeout())
+            self._wake.clear()
+            try:
+                self._drain()
+                self.last_error = None
+            except Exception as exc:
+                # 어떤 오류가 나도 스레드는 살아 있어야 이후 저장이 계속된다
+                self.last_error = str(exc)
+                time.sleep(self.debounce_seconds)
+
+
+# ==================================================
+# 백업 / 복원
+# ==================================================
+BACKUP_DIR = os.path.join(DATA_DIR, "backups")
+BACKUP_INTERVAL_SECONDS = 6 * 60 * 60
+BACKUP_RETENTION = 14
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_PAUSE_SECONDS = 0.005
+SQLITE_SIDECAR_SUFFIXES = ("-wal", "-shm", "-journal")
+
+
+def list_backups():
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    names = [
+        name for name in os.listdir(BACKUP_DIR)
+        if name.startswith("study-") and name.endswith(".db")
+    ]
+    return [os.path.join(BACKUP_DIR, name) for name in sorted(names, reverse=True)]
+
+
+def remove_database_file(path):
+    for suffix in ("",) + SQLITE_SIDECAR_SUFFIXES:
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def prune_backups(keep=BACKUP_RETENTION):
+    for path in list_backups()[keep:]:
+        remove_database_file(path)
+
+
+def backup_database(prune=True):
+    # 온라인 백업: 페이지 단위로 나눠 복사하고 단계 사이에 잠금을 놓아준다.
+    # 읽기 트랜잭션으로 WAL 스냅샷을 고정해 두어야 복사 도중 다른 세션이 쓰더라도
+    # 백업이 처음부터 다시 시작되지 않는다.
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    backup_path = os.path.join(BACKUP_DIR, f"study-{stamp}.db")
+    partial_path = f"{backup_path}.partial"
+    source = get_db_connection()
+    target = sqlite3.connect(partial_path)
+    try:
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        source.backup(
+            target,
+            pages=BACKUP_PAGES_PER_STEP,
+            progress=lambda status, remaining, total: time.sleep(BACKUP_STEP_PAUSE_SECONDS)
+        )
+        # 원본의 WAL 설정이 그대로 복사되므로, 스냅샷은 -wal/-shm 파일 없이
+        # 한 파일로 남도록 롤백 저널 모드로 바꿔 둔다
+        target.execute("PRAGMA journal_mode=DELETE")
+    except BaseException:
+        target.close()
+        source.close()
+        remove_database_file(partial_path)
+        raise
+    target.close()
+    source.close()
+    os.replace(partial_path, backup_path)
+    if prune:
+        prune_backups()
+    return backup_path
+
+
+def verify_database(path):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+        if result != ["ok"]:
+            return False, "; ".join(result[:5])
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'study_records'"
+        ).fetchone()
+        if not has_table:
+            return False, "study_records 테이블이 없습니다."
+        return True, "ok"
+    except sqlite3.DatabaseError as exc:
+        return False, str(exc)
+    finally:
+        conn.close()
+
+
+def restore_database(backup_path):
+    ok, message = verify_database(backup_path)
+    if not ok:
+        raise ValueError(f"백업 파일 검증 실패: {message}")
+    # 복원 직전 상태도 스냅샷으로 남겨 되돌릴 수 있게 한다.
+    # 가장 오래된 백업을 복원할 때 그 파일이 먼저 정리되지 않도록 정리는 복원 뒤로 미룬다.
+    backup_database(prune=False)
+    source = sqlite3.connect(f"file:{backup_path}?mode=ro", uri=True)
+    target = get_db_connection()
+    try:
+        source.backup(target, pages=BACKUP_PAGES_PER_STEP)
+    finally:
+        source.close()
+        target.close()
+    init_db()
+    ok, message = verify_database(DB_PATH)
+    if not ok:
+        raise ValueError(f"복원된 데이터베이스 검증 실패: {message}")
+    prune_backups()
+
+
+class BackupScheduler:
+    def __init__(self, record_writer, interval_seconds=BACKUP_INTERVAL_SECONDS):
+        self.record_writer = record_writer
+        self.interval_seconds = interval_seconds
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="study-db-backup",
+            daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        self._stop.set()
+
+    def _seconds_until_due(self):
+        backups = list_backups()
+        if not backups:
+            return 0
+        age = time.time() - os.path.getmtime(backups[0])
+        return max(self.interval_seconds - age, 0)
+
+    def _run(self):
+        while not self._stop.wait(self._seconds_until_due()):
+            try:
+                self.record_writer.flush()
+                backup_database()
+                self.last_error = None
+            except (OSError, sqlite3.Error) as exc:
+                self.last_error = str(exc)
+                self._stop.wait(60)
+
+
+# ==================================================
+# 공유 캐시 (여러 Streamlit 워커 프로세스가 함께 사용)
+# ==================================================
+CACHE_DB_PATH = os.path.join(DATA_DIR, "cache.db")
+CACHE_MAX_ENTRIES = 500
+CACHE_MAX_VALUE_BYTES = 1024 * 1024
+CACHE_LOCK_SECONDS = 60
+WEATHER_CACHE_SECONDS = 10 * 60
+DOG_CACHE_SECONDS = 24 * 60 * 60
+REPORT_CACHE_SECONDS = 24 * 60 * 60
+# OpenAI 클라이언트 기본 타임아웃(10분)과 재시도보다 잠금이 먼저 풀리지 않도록 넉넉히 잡는다
+REPORT_LOCK_SECONDS = 30 * 60
+TREND_CACHE_SECONDS = 60 * 60
+
+
+# 공유 캐시 저장소 인터페이스. 값은 bytes이고, Redis처럼
+# GET / SET EX / SET NX EX / DEL / 비교 후 DEL(Lua) / SCAN+DEL / DBSIZE 로 옮길 수 있는 연산만 쓴다.
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key):
+        ...
+
+    @abstractmethod
+    def set(self, key, value, ttl_seconds):
+        ...
+
+    @abstractmethod
+    def add(self, key, value, ttl_seconds):
+        ...
+
+    @abstractmethod
+    def delete(self, key):
+        ...
+
+    @abstractmethod
+    def delete_if_equals(self, key, value):
+        ...
+
+    @abstractmethod
+    def delete_prefix(self, prefix):
+        ...
+
+    @abstractmethod
+    def size(self):
+        ...
+
+
+class SQLiteCacheBackend(CacheBackend):
+    def __init__(
+        self,
+        path=CACHE_DB_PATH,
+        max_entries=CACHE_MAX_ENTRIES,
+        max_value_bytes=CACHE_MAX_VALUE_BYTES
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_value_bytes = max_value_bytes
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_created ON cache_entries (created_at)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+            return row[0] if row else None
+
+    def set(self, key, value, ttl_seconds):
+        if len(value) > self.max_value_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl_seconds, now)
+            )
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            # 개수 제한을 넘으면 오래된 값부터 버린다 (진행 중인 잠금은 제외)
+            conn.execute(
+                """
+                DELETE FROM cache_entries
+                WHERE key IN (
+                    SELECT key FROM cache_entries
+                    WHERE key NOT LIKE 'lock:%'
+                    ORDER BY created_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def add(self, key, value, ttl_seconds):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?",
+                (key, now)
+            )
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO cache_entries VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl_seconds, now)
+            )
+            return cur.rowcount == 1
+
+    def delete(self, key):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_if_equals(self, key, value):
+        with self._connect() as conn:
+            cur = conn.execute(
+                "DELETE FROM cache_entries WHERE key = ? AND value = ?",
+                (key, value)
+            )
+            return cur.rowcount == 1
+
+    def delete_prefix(self, prefix):
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix)
+            )
+
+    def size(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE expires_at > ?",
+                (time.time(),)
+            ).fetchone()[0]
+
+
+def cache_key(namespace, *parts):
+    digest = hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class SharedCache:
+    def __init__(self, backend, lock_seconds=CACHE_LOCK_SECONDS, poll_seconds=0.1):
+        self.backend = backend
+        self.lock_seconds = lock_seconds
+        self.poll_seconds = poll_seconds
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _load(self, key):
+        value = self.backend.get(key)
+        return None if value is None else pickle.loads(value)
+
+    def get_or_compute(self, key, ttl_seconds, compute, lock_seconds=None):
+        # 잠금 키를 SET NX로 잡은 워커 하나만 계산하고, 나머지는 결과가 올라올 때까지 기다린다.
+        # 잠금 값은 호출마다 다른 토큰이라, 잠금이 만료된 뒤 다른 워커가 잡은 잠금을
+        # 먼저 계산하던 워커가 지우지 않는다. None은 실패로 보고 캐시하지 않는다.
+        value = self._load(key)
+        if value is not None:
+            self._count(hit=True)
+            return value
+        lock_seconds = lock_seconds or self.lock_seconds
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().bytes
+        deadline = time.monotonic() + lock_seconds
+        while not self.backend.add(lock_key, token, lock_seconds):
+            time.sleep(self.poll_seconds)
+            value = self._load(key)
+            if value is not None:
+                self._count(hit=True)
+                return value
+            if time.monotonic() >= deadline:
+                self._count(hit=False)
+                return compute()
+        try:
+            value = self._load(key)
+            if value is not None:
+                self._count(hit=True)
+                return value
+            self._count(hit=False)
+            value = compute()
+            if value is not None:
+                self.backend.set(key, pickle.dumps(value), ttl_seconds)
+            return value
+        finally:
+            self.backend.delete_if_equals(lock_key, token)
+
+    def invalidate(self, prefix):
+        self.backend.delete_prefix(prefix)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
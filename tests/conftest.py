@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import study_store  # noqa: E402
+
+
+@pytest.fixture
+def study_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(study_store, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(study_store, "DB_PATH", str(tmp_path / "study.db"))
+    study_store.init_db()
+    return tmp_path
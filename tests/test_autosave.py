@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+import study_store
+from study_store import RecordWriteBehindQueue, StudyRecord
+
+
+@pytest.fixture
+def writes(study_db, monkeypatch):
+    calls = []
+    upsert_records = study_store.upsert_records
+
+    def recording_upsert(records):
+        upsert_records(records)
+        calls.append(list(records))
+
+    monkeypatch.setattr(study_store, "upsert_records", recording_upsert)
+    return calls
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(study_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_writer(request, **kwargs):
+    writer = RecordWriteBehindQueue(**kwargs)
+    request.addfinalizer(writer.close)
+    return writer
+
+
+def test_repeated_submits_collapse_into_one_write(request, writes):
+    writer = make_writer(request, debounce_seconds=60)
+    for notes in ("a", "ab", "abc"):
+        writer.submit(StudyRecord("2026-01-01", notes=notes))
+    assert writer.pending_count() == 1
+    writer.flush()
+    assert writes == [[StudyRecord("2026-01-01", notes="abc")]]
+
+
+def test_max_delay_caps_the_debounce(request, writes, clock):
+    writer = make_writer(request, debounce_seconds=60, max_delay_seconds=120)
+    writer.submit(StudyRecord("2026-01-01", notes="a"))
+    clock[0] += 100
+    writer.submit(StudyRecord("2026-01-01", notes="ab"))
+    clock[0] += 19
+    writer._drain()
+    assert writes == []
+    clock[0] += 1
+    writer._drain()
+    assert writes == [[StudyRecord("2026-01-01", notes="ab")]]
+
+
+def test_discard_drops_a_pending_record(request, writes):
+    writer = make_writer(request, debounce_seconds=60)
+    writer.submit(StudyRecord("2026-01-01", notes="draft"))
+    writer.discard("2026-01-01")
+    writer.flush()
+    assert writes == []
+    assert study_store.fetch_record("2026-01-01") is None
+
+
+def test_failed_write_is_requeued_without_overwriting_newer_value(
+    request, study_db, monkeypatch
+):
+    writer = make_writer(request, debounce_seconds=60)
+    upsert_records = study_store.upsert_records
+    failures = []
+
+    def failing_once(records):
+        if not failures:
+            # 쓰는 도중에 더 새로운 값이 들어온 상황
+            failures.append(records)
+            writer.submit(StudyRecord("2026-01-01", notes="newer"))
+            raise RuntimeError("disk unplugged")
+        upsert_records(records)
+
+    monkeypatch.setattr(study_store, "upsert_records", failing_once)
+    writer.submit(StudyRecord("2026-01-01", notes="older"))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.pending_count() == 1
+    writer.flush()
+    assert study_store.fetch_record("2026-01-01").notes == "newer"
+
+
+def test_background_thread_survives_errors_and_reports_them(
+    request, study_db, monkeypatch
+):
+    writer = make_writer(request, debounce_seconds=0.01)
+    upsert_records = study_store.upsert_records
+    failures = []
+
+    def failing_once(records):
+        if not failures:
+            failures.append(records)
+            raise RuntimeError("disk unplugged")
+        upsert_records(records)
+
+    monkeypatch.setattr(study_store, "upsert_records", failing_once)
+    writer.submit(StudyRecord("2026-01-01", notes="memo"))
+    deadline = time.monotonic() + 5
+    saved = None
+    while (saved is None or writer.last_error) and time.monotonic() < deadline:
+        time.sleep(0.01)
+        saved = study_store.fetch_record("2026-01-01")
+    assert failures
+    assert saved.notes == "memo"
+    assert writer.last_error is None
+
+
+def test_close_flushes_pending_records(study_db):
+    writer = RecordWriteBehindQueue(debounce_seconds=60)
+    writer.submit(StudyRecord("2026-01-01", notes="memo"))
+    writer.close()
+    assert writer.pending_count() == 0
+    assert study_store.fetch_record("2026-01-01").notes == "memo"
@@ -0,0 +1,80 @@
+import os
+import sqlite3
+
+import pytest
+
+import study_store
+from study_store import StudyRecord
+
+
+@pytest.fixture
+def study_db(study_db, monkeypatch):
+    monkeypatch.setattr(study_store, "BACKUP_DIR", str(study_db / "backups"))
+    study_store.upsert_record(StudyRecord("2026-01-01", notes="first"))
+    return study_db
+
+
+def test_backup_is_a_single_rollback_journal_file(study_db):
+    path = study_store.backup_database()
+    ok, _ = study_store.verify_database(path)
+    assert ok
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    finally:
+        conn.close()
+    assert os.listdir(study_db / "backups") == [os.path.basename(path)]
+
+
+def test_prune_removes_sidecar_files(study_db):
+    paths = [study_store.backup_database() for _ in range(3)]
+    for path in paths:
+        for suffix in ("-wal", "-shm"):
+            open(path + suffix, "wb").close()
+    study_store.prune_backups(keep=1)
+    assert sorted(os.listdir(study_db / "backups")) == sorted(
+        os.path.basename(paths[-1]) + suffix for suffix in ("", "-wal", "-shm")
+    )
+
+
+class LockedConnection(sqlite3.Connection):
+    def backup(self, *args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_failed_backup_leaves_no_partial_file(study_db, monkeypatch):
+    monkeypatch.setattr(
+        study_store,
+        "get_db_connection",
+        lambda: sqlite3.connect(study_store.DB_PATH, factory=LockedConnection)
+    )
+    with pytest.raises(sqlite3.OperationalError):
+        study_store.backup_database()
+    assert os.listdir(study_db / "backups") == []
+
+
+def test_restore_rejects_corrupt_snapshot(study_db):
+    corrupt = study_db / "backups" / "study-corrupt.db"
+    os.makedirs(corrupt.parent, exist_ok=True)
+    corrupt.write_bytes(b"not a database" * 100)
+    with pytest.raises(ValueError):
+        study_store.restore_database(str(corrupt))
+    assert study_store.fetch_record("2026-01-01").notes == "first"
+
+
+def test_restore_round_trip(study_db):
+    path = study_store.backup_database()
+    study_store.upsert_record(StudyRecord("2026-01-01", notes="second"))
+    study_store.restore_database(path)
+    assert study_store.fetch_record("2026-01-01").notes == "first"
+
+
+def test_restore_oldest_retained_backup(study_db):
+    oldest = study_store.backup_database()
+    study_store.upsert_record(StudyRecord("2026-01-01", notes="second"))
+    for _ in range(study_store.BACKUP_RETENTION - 1):
+        study_store.backup_database()
+    assert study_store.list_backups()[-1] == oldest
+    study_store.restore_database(oldest)
+    assert study_store.fetch_record("2026-01-01").notes == "first"
+    assert len(study_store.list_backups()) == study_store.BACKUP_RETENTION
@@ -0,0 +1,27 @@
+import study_store
+from study_store import StudyRecord, compute_achievement, record_pomodoro_session
+
+
+def test_first_session_of_the_day_gets_an_achievement(study_db):
+    saved = record_pomodoro_session("2026-01-01", 25, 120)
+    assert (saved.sessions, saved.focus_minutes) == (1, 25)
+    assert saved.achievement == compute_achievement([False] * 6, 25, 6, 120)
+    assert study_store.fetch_record("2026-01-01") == saved
+
+
+def test_session_updates_only_counters_and_achievement(study_db):
+    study_store.upsert_record(
+        StudyRecord("2026-01-01", task_plan=True, focus_minutes=100, sessions=4, notes="memo")
+    )
+    saved = record_pomodoro_session("2026-01-01", 25, 120)
+    assert (saved.sessions, saved.focus_minutes, saved.notes) == (5, 125, "memo")
+    assert saved.achievement == compute_achievement(
+        [True] + [False] * 5, 125, 6, 120
+    )
+    assert study_store.fetch_record("2026-01-01") == saved
+
+
+def test_session_counters_stay_within_widget_limits(study_db):
+    study_store.upsert_record(StudyRecord("2026-01-01", focus_minutes=350, sessions=12))
+    saved = record_pomodoro_session("2026-01-01", 25, 120)
+    assert (saved.sessions, saved.focus_minutes) == (12, 360)
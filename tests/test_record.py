@@ -0,0 +1,66 @@
+from array import array
+from dataclasses import fields
+
+import numpy as np
+import pytest
+
+import study_store
+from study_store import (
+    INTEGER_COLUMNS,
+    RECORD_COLUMNS,
+    StudyRecord,
+    column_values,
+    fetch_columns
+)
+
+
+def test_columns_follow_the_dataclass():
+    assert RECORD_COLUMNS == tuple(f.name for f in fields(StudyRecord))
+    assert INTEGER_COLUMNS == RECORD_COLUMNS[1:14]
+
+
+def test_row_conversion_round_trips():
+    record = StudyRecord(
+        "2026-01-01",
+        task_plan=True,
+        task_summary=True,
+        focus_minutes=150,
+        achievement=77,
+        subjects=["수학", "코딩"],
+        notes="memo"
+    )
+    row = record.to_row()
+    assert row[1] == 1 and row[6] == 1
+    assert row[RECORD_COLUMNS.index("subjects")] == "수학,코딩"
+    assert StudyRecord.from_row(row) == record
+
+
+def test_table_columns_match_record_order(study_db):
+    with study_store.get_db_connection() as conn:
+        table_columns = [row[1] for row in conn.execute("PRAGMA table_info(study_records)")]
+    assert tuple(table_columns) == RECORD_COLUMNS
+
+
+def test_fetch_record_returns_study_record(study_db):
+    record = StudyRecord("2026-01-01", task_review=True, subjects=["영어"], notes="n")
+    study_store.upsert_record(record)
+    assert study_store.fetch_record("2026-01-01") == record
+    assert study_store.fetch_record("2026-01-02") is None
+
+
+def test_fetch_columns_returns_typed_arrays(study_db):
+    study_store.upsert_records([
+        StudyRecord(f"2026-01-0{day}", focus_minutes=day * 10) for day in range(1, 6)
+    ])
+    columns = fetch_columns(("date", "focus_minutes"), "2026-01-02", "2026-01-05")
+    assert columns["date"] == ["2026-01-02", "2026-01-03", "2026-01-04"]
+    assert isinstance(columns["focus_minutes"], array)
+    values = column_values(columns["focus_minutes"])
+    assert values.dtype == np.int64
+    assert values.tolist() == [20, 30, 40]
+    assert np.shares_memory(values, np.frombuffer(columns["focus_minutes"], dtype=np.int64))
+
+
+def test_fetch_columns_rejects_unknown_columns(study_db):
+    with pytest.raises(ValueError):
+        fetch_columns(("date", "date; DROP TABLE study_records",))
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+
+from study_store import CacheBackend, SharedCache, SQLiteCacheBackend, cache_key
+
+
+@pytest.fixture
+def backend(tmp_path):
+    return SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=3)
+
+
+def test_backend_interface_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_expired_lock_is_not_released_by_previous_holder(backend):
+    assert backend.add("lock:k", b"first", 0.05)
+    time.sleep(0.1)
+    assert backend.add("lock:k", b"second", 60)
+    assert not backend.delete_if_equals("lock:k", b"first")
+    assert not backend.add("lock:k", b"third", 60)
+    assert backend.delete_if_equals("lock:k", b"second")
+
+
+def test_entry_limit_evicts_oldest(backend):
+    for index in range(5):
+        backend.set(f"k{index}", b"v", 60)
+    assert backend.size() == 3
+    assert backend.get("k0") is None
+    assert backend.get("k4") == b"v"
+
+
+def test_only_one_caller_computes(backend):
+    cache = SharedCache(backend, poll_seconds=0.01)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"temp": 20}
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                cache.get_or_compute(cache_key("weather", "Seoul"), 60, compute)
+            )
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"temp": 20}] * 5
+    assert cache.hits == 4
+    assert cache.misses == 1
+
+
+def test_slow_compute_keeps_a_newer_lock(backend):
+    cache = SharedCache(backend, poll_seconds=0.01)
+    key = cache_key("report", "slow")
+    first_started = threading.Event()
+    release_first = threading.Event()
+
+    def slow():
+        first_started.set()
+        release_first.wait(5)
+        return None
+
+    first = threading.Thread(
+        target=lambda: cache.get_or_compute(key, 60, slow, lock_seconds=0.05)
+    )
+    first.start()
+    first_started.wait(5)
+    time.sleep(0.1)
+    # 첫 번째 잠금이 만료된 뒤 다른 워커가 잠금을 잡는다
+    assert backend.add(f"lock:{key}", b"other-worker", 60)
+    release_first.set()
+    first.join()
+    assert not backend.add(f"lock:{key}", b"third-worker", 60)
+
+
+def test_none_is_not_cached(backend):
+    cache = SharedCache(backend)
+    assert cache.get_or_compute("weather:x", 60, lambda: None) is None
+    assert cache.get_or_compute("weather:x", 60, lambda: 1) == 1
@@ -0,0 +1,54 @@
+import random
+from datetime import date, timedelta
+
+import study_store
+from study_store import CHART_MAX_POINTS, StudyRecord, lttb_indices
+
+
+def seed_days(count):
+    today = date.today()
+    study_store.upsert_records([
+        StudyRecord(
+            (today - timedelta(days=offset)).isoformat(),
+            focus_minutes=random.randint(0, 360),
+            achievement=random.randint(0, 100)
+        )
+        for offset in range(count)
+    ])
+
+
+def test_lttb_bounds_points_and_keeps_endpoints():
+    xs = list(range(CHART_MAX_POINTS * 8))
+    ys = [random.random() for _ in xs]
+    keep = lttb_indices(xs, ys, CHART_MAX_POINTS)
+    assert len(keep) <= CHART_MAX_POINTS
+    assert keep == sorted(set(keep))
+    assert keep[0] == 0
+    assert keep[-1] == len(xs) - 1
+
+
+def test_lttb_keeps_short_series_untouched():
+    xs = list(range(10))
+    assert lttb_indices(xs, xs, CHART_MAX_POINTS) == xs
+
+
+def test_lttb_keeps_spike():
+    xs = list(range(1000))
+    ys = [0] * 1000
+    ys[537] = 100
+    assert 537 in lttb_indices(xs, ys, 50)
+
+
+def test_weekly_trend_aggregates_in_sql(study_db):
+    seed_days(21)
+    rows = study_store.fetch_trend("week")
+    assert 3 <= len(rows) <= 4
+    assert all(date.fromisoformat(row[0]).weekday() == 0 for row in rows)
+
+
+def test_all_time_trend_is_bounded(study_db):
+    seed_days(365 * 10)
+    data = study_store.load_trend_chart_data("전체")
+    for series in data.values():
+        assert len(series) <= CHART_MAX_POINTS
+        assert series.index.is_monotonic_increasing